@@ -2,16 +2,16 @@ import json
 import math
 import os
 import random
-from dataclasses import dataclass
 
+import numpy as np
 import pygame
-from pygame.math import Vector2
 
 # ==============================
 # Настройки игры
 # ==============================
 WIDTH, HEIGHT = 960, 600
 FPS = 60
+VSYNC_FPS_CAP = 240  # страховка, если драйвер проигнорирует vsync
 TITLE = "Neon Drift Arena"
 
 DATA_FILE = "save_data.json"
@@ -26,10 +26,39 @@ GREEN = (80, 255, 170)
 BLUE = (80, 180, 255)
 YELLOW = (255, 215, 90)
 PURPLE = (180, 110, 255)
+ENEMY_COLORS = (RED, PURPLE, (255, 120, 80))
 
+# Таблицы cos/sin для лопастей врагов: окружность разбита на 256 делений
+TRIG_STEPS = 256
+COS_TABLE = [math.cos(i * math.tau / TRIG_STEPS) for i in range(TRIG_STEPS)]
+SIN_TABLE = [math.sin(i * math.tau / TRIG_STEPS) for i in range(TRIG_STEPS)]
+BLADE_STEPS = tuple(round(i * TRIG_STEPS / 3) for i in range(3))
+BLADE_TIP_STEP = round(0.35 * TRIG_STEPS / math.tau)
 
-def clamp(value, a, b):
-    return max(a, min(b, value))
+
+# Кэш заранее отрисованных спрайтов свечения: ((r, g, b, a), радиус) -> Surface
+GLOW_CACHE: dict[tuple[tuple, int], pygame.Surface] = {}
+
+
+def get_glow(color: tuple, radius: int) -> pygame.Surface:
+    """Возвращает спрайт полупрозрачного круга, отрисовывая его только один раз."""
+    key = (color, radius)
+    glow = GLOW_CACHE.get(key)
+    if glow is None:
+        tmp = pygame.Surface((radius * 2 + 8, radius * 2 + 8), pygame.SRCALPHA)
+        pygame.draw.circle(tmp, color, (radius + 4, radius + 4), radius)
+        glow = tmp.convert_alpha()
+        GLOW_CACHE[key] = glow
+    return glow
+
+
+def blit_batch(surface: pygame.Surface, sprites: list):
+    """Выводит список пар (спрайт, позиция) одним вызовом вместо сотен blit."""
+    if sprites:
+        if hasattr(surface, "fblits"):
+            surface.fblits(sprites)
+        else:
+            surface.blits(sprites, doreturn=False)
 
 
 def load_best_score():
@@ -70,40 +99,106 @@ class Timer:
         return self.time_left > 0.0
 
 
-@dataclass
-class Particle:
-    pos: Vector2
-    vel: Vector2
-    life: float
-    max_life: float
-    radius: float
-    color: tuple
+class ParticlePool:
+    """Все частицы в виде массивов NumPy (Struct-of-Arrays) вместо списка объектов."""
+    def __init__(self, capacity: int = 2048):
+        self.capacity = capacity
+        # Оси x/y лежат в одном массиве, чтобы шаг симуляции обходился одной операцией на поле
+        self.pos = np.empty((2, capacity), dtype=np.float32)
+        self.vel = np.empty((2, capacity), dtype=np.float32)
+        self.pos_x, self.pos_y = self.pos
+        self.vel_x, self.vel_y = self.vel
+        self._scratch = np.empty((2, capacity), dtype=np.float32)
+        self.life = np.empty(capacity, dtype=np.float32)
+        self.max_life = np.empty(capacity, dtype=np.float32)
+        self.radius = np.empty(capacity, dtype=np.float32)
+        self.color_idx = np.empty(capacity, dtype=np.uint8)
+        self.colors: list[tuple] = []
+        self.active_count = 0
+
+        self._arrays = (
+            self.pos_x, self.pos_y, self.vel_x, self.vel_y,
+            self.life, self.max_life, self.radius, self.color_idx,
+        )
 
-    def update(self, dt: float):
-        self.pos += self.vel * dt
-        self.vel *= 0.97
-        self.life -= dt
+    def __len__(self) -> int:
+        return self.active_count
 
-    def draw(self, surface: pygame.Surface):
-        if self.life <= 0:
+    def emit(self, x, y, vel_x, vel_y, life, radius, color: tuple):
+        """Добавляет частицы; скаляры растягиваются на всю пачку, лишнее сверх ёмкости отбрасывается."""
+        n = self.active_count
+        count = min(np.size(vel_x), self.capacity - n)
+        if count <= 0:
+            return
+        if color not in self.colors:
+            self.colors.append(color)
+
+        end = n + count
+        for arr, values in (
+            (self.pos_x, x), (self.pos_y, y), (self.vel_x, vel_x), (self.vel_y, vel_y),
+            (self.life, life), (self.radius, radius),
+        ):
+            arr[n:end] = values if np.ndim(values) == 0 else values[:count]
+        self.max_life[n:end] = self.life[n:end]
+        self.color_idx[n:end] = self.colors.index(color)
+        self.active_count = end
+
+    def update(self, dt: float):
+        n = self.active_count
+        if n == 0:
             return
-        alpha = clamp(self.life / self.max_life, 0.0, 1.0)
-        r = max(1, int(self.radius * (0.6 + alpha)))
-        tmp = pygame.Surface((r * 2 + 4, r * 2 + 4), pygame.SRCALPHA)
-        pygame.draw.circle(
-            tmp,
-            (*self.color, int(170 * alpha)),
-            (tmp.get_width() // 2, tmp.get_height() // 2),
-            r,
+        # Все операции на месте: без временных массивов на каждый кадр
+        step = np.multiply(self.vel[:, :n], dt, out=self._scratch[:, :n])
+        self.pos[:, :n] += step
+        self.vel[:, :n] *= 0.97
+        self.life[:n] -= dt
+
+        # Уплотняем массивы: живые частицы сдвигаются в начало
+        alive = self.life[:n] > 0
+        k = int(np.count_nonzero(alive))
+        if k < n:
+            for arr in self._arrays:
+                arr[:k] = arr[:n][alive]
+            self.active_count = k
+
+    def append_glow(self, batch: list):
+        n = self.active_count
+        if n == 0:
+            return
+        alpha = np.clip(self.life[:n] / self.max_life[:n], 0.0, 1.0)
+        # Квантуем радиус (шаг 2px) и прозрачность (8 ступеней), чтобы кэш оставался маленьким
+        r = np.maximum(1, (self.radius[:n] * (0.6 + alpha)).astype(np.int32) & ~1)
+        level = (alpha * 7 + 0.5).astype(np.int32)
+        # Не рисуем полностью прозрачные (нулевая ступень) и улетевшие за край экрана
+        x = self.pos_x[:n]
+        y = self.pos_y[:n]
+        half = r + 4
+        visible = (
+            (level > 0)
+            & (x + half >= 0) & (x - half <= WIDTH)
+            & (y + half >= 0) & (y - half <= HEIGHT)
         )
-        surface.blit(tmp, (self.pos.x - tmp.get_width() / 2, self.pos.y - tmp.get_height() / 2))
+        r = r[visible]
+        level = level[visible]
+        # Спрайт свечения имеет размер 2r + 8, позиция — его левый верхний угол
+        xs = x[visible] - (r + 4)
+        ys = y[visible] - (r + 4)
+
+        colors = self.colors
+        for ci, rr, lv, gx, gy in zip(
+            self.color_idx[:n][visible].tolist(), r.tolist(), level.tolist(), xs.tolist(), ys.tolist()
+        ):
+            batch.append((get_glow((*colors[ci], 170 * lv // 7), rr), (gx, gy)))
 
 
 class Player:
     """Игрок: перемещение, рывок (dash), столкновение."""
     def __init__(self):
-        self.pos = Vector2(WIDTH / 2, HEIGHT / 2)
-        self.vel = Vector2()
+        # Координаты и скорость хранятся скалярами: без временных Vector2 на каждом шаге
+        self.x = WIDTH / 2
+        self.y = HEIGHT / 2
+        self.vx = 0.0
+        self.vy = 0.0
         self.radius = 16
         self.base_speed = 280
         self.alive = True
@@ -112,39 +207,44 @@ class Player:
         self.dash_cooldown = Timer()
         self.invuln_timer = Timer()
 
-        self.dash_direction = Vector2(1, 0)
+        self.dash_dx = 1.0
+        self.dash_dy = 0.0
         self.trail_accum = 0.0
 
     def handle_input(self, dt: float):
         keys = pygame.key.get_pressed()
 
-        # Вектор направления от клавиш WASD / стрелок
-        direction = Vector2(
-            (1 if keys[pygame.K_d] or keys[pygame.K_RIGHT] else 0)
-            - (1 if keys[pygame.K_a] or keys[pygame.K_LEFT] else 0),
-            (1 if keys[pygame.K_s] or keys[pygame.K_DOWN] else 0)
-            - (1 if keys[pygame.K_w] or keys[pygame.K_UP] else 0),
+        # Направление от клавиш WASD / стрелок
+        dx = (1 if keys[pygame.K_d] or keys[pygame.K_RIGHT] else 0) - (
+            1 if keys[pygame.K_a] or keys[pygame.K_LEFT] else 0
+        )
+        dy = (1 if keys[pygame.K_s] or keys[pygame.K_DOWN] else 0) - (
+            1 if keys[pygame.K_w] or keys[pygame.K_UP] else 0
         )
 
-        if direction.length_squared() > 0:
-            direction = direction.normalize()
-            self.dash_direction = direction
-        else:
-            direction = Vector2()
+        if dx or dy:
+            inv = 1.0 / math.sqrt(dx * dx + dy * dy)
+            dx *= inv
+            dy *= inv
+            self.dash_dx = dx
+            self.dash_dy = dy
 
         # Если рывок активен — обычное движение отключаем
         if self.dash_timer.active:
-            self.vel = self.dash_direction * 780
+            self.vx = self.dash_dx * 780
+            self.vy = self.dash_dy * 780
         else:
-            target_vel = direction * self.base_speed
             # Плавность управления (инерция)
-            self.vel = self.vel.lerp(target_vel, clamp(dt * 10.0, 0.0, 1.0))
+            t = min(dt * 10.0, 1.0)
+            self.vx += (dx * self.base_speed - self.vx) * t
+            self.vy += (dy * self.base_speed - self.vy) * t
 
         # Рывок по Space / Shift
         dash_pressed = keys[pygame.K_SPACE] or keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]
         if dash_pressed and (not self.dash_timer.active) and (not self.dash_cooldown.active):
-            if self.dash_direction.length_squared() == 0:
-                self.dash_direction = Vector2(1, 0)
+            if self.dash_dx == 0 and self.dash_dy == 0:
+                self.dash_dx = 1.0
+                self.dash_dy = 0.0
             self.dash_timer.start(0.12)
             self.dash_cooldown.start(1.0)
             self.invuln_timer.start(0.18)
@@ -154,120 +254,125 @@ class Player:
         self.dash_cooldown.update(dt)
         self.invuln_timer.update(dt)
 
-        self.pos += self.vel * dt
+        self.x += self.vx * dt
+        self.y += self.vy * dt
 
         # Ограничение игрока внутри окна
-        self.pos.x = clamp(self.pos.x, self.radius, WIDTH - self.radius)
-        self.pos.y = clamp(self.pos.y, self.radius, HEIGHT - self.radius)
+        r = self.radius
+        self.x = max(r, min(self.x, WIDTH - r))
+        self.y = max(r, min(self.y, HEIGHT - r))
 
     def can_be_hit(self):
         return not self.invuln_timer.active
 
-    def draw(self, surface: pygame.Surface):
+    def append_glow(self, batch: list, pulse: float):
         # Внешнее свечение
         glow_r = self.radius + 10
-        glow = pygame.Surface((glow_r * 2 + 8, glow_r * 2 + 8), pygame.SRCALPHA)
-        pulse = 0.8 + 0.2 * math.sin(pygame.time.get_ticks() * 0.01)
+        # Пульсация квантуется до 8 ступеней прозрачности
+        pulse = 0.6 + 0.4 * int((pulse - 0.6) * 17.5 + 0.5) / 7
         glow_alpha = 90 if not self.invuln_timer.active else 150
-        pygame.draw.circle(
-            glow,
-            (80, 200, 255, int(glow_alpha * pulse)),
-            (glow.get_width() // 2, glow.get_height() // 2),
-            glow_r,
-        )
-        surface.blit(glow, (self.pos.x - glow.get_width() / 2, self.pos.y - glow.get_height() / 2))
+        glow = get_glow((80, 200, 255, int(glow_alpha * pulse)), glow_r)
+        batch.append((glow, (self.x - glow.get_width() / 2, self.y - glow.get_height() / 2)))
 
+    def draw(self, surface: pygame.Surface):
         # Тело игрока
+        center = (int(self.x), int(self.y))
         body_color = BLUE if not self.invuln_timer.active else YELLOW
-        pygame.draw.circle(surface, body_color, (int(self.pos.x), int(self.pos.y)), self.radius)
-        pygame.draw.circle(surface, WHITE, (int(self.pos.x), int(self.pos.y)), self.radius - 6)
+        pygame.draw.circle(surface, body_color, center, self.radius)
+        pygame.draw.circle(surface, WHITE, center, self.radius - 6)
 
         # Небольшая "стрелка" направления
-        nose = self.pos + self.dash_direction * (self.radius + 6)
-        pygame.draw.line(surface, body_color, self.pos, nose, 3)
+        nose_len = self.radius + 6
+        nose = (self.x + self.dash_dx * nose_len, self.y + self.dash_dy * nose_len)
+        pygame.draw.line(surface, body_color, (self.x, self.y), nose, 3)
 
 
 class Enemy:
     """Враг — движется по направлению и отскакивает от границ."""
     def __init__(self, difficulty_level: int):
-        spawn_side = random.choice(["top", "bottom", "left", "right"])
+        rand = random.random
+        # Сторона появления: 0 — сверху, 1 — снизу, 2 — слева, 3 — справа
+        spawn_side = random.getrandbits(2)
 
         margin = 30
-        if spawn_side == "top":
-            self.pos = Vector2(random.randint(0, WIDTH), -margin)
-            direction = Vector2(random.uniform(-0.6, 0.6), random.uniform(0.4, 1.0))
-        elif spawn_side == "bottom":
-            self.pos = Vector2(random.randint(0, WIDTH), HEIGHT + margin)
-            direction = Vector2(random.uniform(-0.6, 0.6), random.uniform(-1.0, -0.4))
-        elif spawn_side == "left":
-            self.pos = Vector2(-margin, random.randint(0, HEIGHT))
-            direction = Vector2(random.uniform(0.4, 1.0), random.uniform(-0.6, 0.6))
+        if spawn_side == 0:
+            self.x, self.y = rand() * WIDTH, -margin
+            dx, dy = rand() * 1.2 - 0.6, rand() * 0.6 + 0.4
+        elif spawn_side == 1:
+            self.x, self.y = rand() * WIDTH, HEIGHT + margin
+            dx, dy = rand() * 1.2 - 0.6, rand() * 0.6 - 1.0
+        elif spawn_side == 2:
+            self.x, self.y = -margin, rand() * HEIGHT
+            dx, dy = rand() * 0.6 + 0.4, rand() * 1.2 - 0.6
         else:
-            self.pos = Vector2(WIDTH + margin, random.randint(0, HEIGHT))
-            direction = Vector2(random.uniform(-1.0, -0.4), random.uniform(-0.6, 0.6))
+            self.x, self.y = WIDTH + margin, rand() * HEIGHT
+            dx, dy = rand() * 0.6 - 1.0, rand() * 1.2 - 0.6
 
-        self.direction = direction.normalize()
-        self.radius = random.randint(10, 22)
+        # Единичный вектор направления
+        inv = 1.0 / math.sqrt(dx * dx + dy * dy)
+        self.dx = dx * inv
+        self.dy = dy * inv
+        self.radius = 10 + int(rand() * 13)
 
         # Скорость растёт от сложности
-        base_speed = random.uniform(140, 220)
-        self.speed = base_speed + difficulty_level * random.uniform(4, 9)
+        base_speed = 140 + rand() * 80
+        self.speed = base_speed + difficulty_level * (4 + rand() * 5)
 
-        self.spin = random.uniform(-4, 4)
-        self.angle = random.uniform(0, math.tau)
-        self.color = random.choice([RED, PURPLE, (255, 120, 80)])
+        self.spin = rand() * 8 - 4
+        self.angle = rand() * math.tau
+        self.color = ENEMY_COLORS[int(rand() * 3)]
 
     def update(self, dt: float):
-        self.pos += self.direction * self.speed * dt
+        step = self.speed * dt
+        self.x += self.dx * step
+        self.y += self.dy * step
         self.angle += self.spin * dt
 
         # Мягкий отскок от границ внутри экрана
-        if self.pos.x < self.radius:
-            self.pos.x = self.radius
-            self.direction.x *= -1
-        elif self.pos.x > WIDTH - self.radius:
-            self.pos.x = WIDTH - self.radius
-            self.direction.x *= -1
-
-        if self.pos.y < self.radius:
-            self.pos.y = self.radius
-            self.direction.y *= -1
-        elif self.pos.y > HEIGHT - self.radius:
-            self.pos.y = HEIGHT - self.radius
-            self.direction.y *= -1
-
-    def draw(self, surface: pygame.Surface):
+        r = self.radius
+        if self.x < r:
+            self.x = r
+            self.dx = -self.dx
+        elif self.x > WIDTH - r:
+            self.x = WIDTH - r
+            self.dx = -self.dx
+
+        if self.y < r:
+            self.y = r
+            self.dy = -self.dy
+        elif self.y > HEIGHT - r:
+            self.y = HEIGHT - r
+            self.dy = -self.dy
+
+    def append_glow(self, batch: list):
         # Свечение
-        g = self.radius + 8
-        glow = pygame.Surface((g * 2 + 6, g * 2 + 6), pygame.SRCALPHA)
-        pygame.draw.circle(glow, (*self.color, 80), (glow.get_width() // 2, glow.get_height() // 2), g)
-        surface.blit(glow, (self.pos.x - glow.get_width() / 2, self.pos.y - glow.get_height() / 2))
+        glow = get_glow((*self.color, 80), self.radius + 8)
+        batch.append((glow, (self.x - glow.get_width() / 2, self.y - glow.get_height() / 2)))
 
+    def draw(self, surface: pygame.Surface):
         # Тело
-        pygame.draw.circle(surface, self.color, (int(self.pos.x), int(self.pos.y)), self.radius)
-        pygame.draw.circle(surface, (35, 35, 45), (int(self.pos.x), int(self.pos.y)), max(2, self.radius - 5))
+        x, y = self.x, self.y
+        center = (int(x), int(y))
+        pygame.draw.circle(surface, self.color, center, self.radius)
+        pygame.draw.circle(surface, (35, 35, 45), center, max(2, self.radius - 5))
 
         # "Лопасти" для движения
-        for i in range(3):
-            ang = self.angle + i * (math.tau / 3)
-            p1 = self.pos + Vector2(math.cos(ang), math.sin(ang)) * (self.radius - 2)
-            p2 = self.pos + Vector2(math.cos(ang + 0.35), math.sin(ang + 0.35)) * 6
+        blade = self.radius - 2
+        base = int(self.angle * (TRIG_STEPS / math.tau))
+        for step in BLADE_STEPS:
+            i = (base + step) & (TRIG_STEPS - 1)
+            j = (i + BLADE_TIP_STEP) & (TRIG_STEPS - 1)
+            p1 = (x + COS_TABLE[i] * blade, y + SIN_TABLE[i] * blade)
+            p2 = (x + COS_TABLE[j] * 6, y + SIN_TABLE[j] * 6)
             pygame.draw.line(surface, WHITE, p1, p2, 2)
 
-    def collides_with_player(self, player: "Player") -> bool:
-        dist2 = (self.pos - player.pos).length_squared()
-        r = self.radius + player.radius
-        return dist2 <= r * r
-
 
 class EnergyOrb:
     """Сфера энергии: даёт очки и поддерживает комбо."""
     def __init__(self):
         margin = 40
-        self.pos = Vector2(
-            random.randint(margin, WIDTH - margin),
-            random.randint(margin, HEIGHT - margin),
-        )
+        self.x = random.randint(margin, WIDTH - margin)
+        self.y = random.randint(margin, HEIGHT - margin)
         self.radius = 10
         self.pulse_phase = random.uniform(0, math.tau)
         self.value = 25
@@ -275,53 +380,110 @@ class EnergyOrb:
     def update(self, dt: float):
         self.pulse_phase += dt * 4.2
 
-    def draw(self, surface: pygame.Surface):
-        pulse = 1.0 + 0.15 * math.sin(self.pulse_phase)
-        r = int(self.radius * pulse)
+    def current_radius(self) -> int:
+        return int(self.radius * (1.0 + 0.15 * math.sin(self.pulse_phase)))
 
-        glow_r = r + 10
-        glow = pygame.Surface((glow_r * 2 + 8, glow_r * 2 + 8), pygame.SRCALPHA)
-        pygame.draw.circle(glow, (80, 255, 170, 90), (glow.get_width() // 2, glow.get_height() // 2), glow_r)
-        surface.blit(glow, (self.pos.x - glow.get_width() / 2, self.pos.y - glow.get_height() / 2))
+    def append_glow(self, batch: list):
+        glow = get_glow((80, 255, 170, 90), self.current_radius() + 10)
+        batch.append((glow, (self.x - glow.get_width() / 2, self.y - glow.get_height() / 2)))
 
-        pygame.draw.circle(surface, GREEN, (int(self.pos.x), int(self.pos.y)), r)
-        pygame.draw.circle(surface, WHITE, (int(self.pos.x), int(self.pos.y)), max(2, r - 5))
+    def draw(self, surface: pygame.Surface):
+        r = self.current_radius()
+        center = (int(self.x), int(self.y))
+        pygame.draw.circle(surface, GREEN, center, r)
+        pygame.draw.circle(surface, WHITE, center, max(2, r - 5))
 
     def collides_with_player(self, player: "Player") -> bool:
-        dist2 = (self.pos - player.pos).length_squared()
+        dx = self.x - player.x
+        dy = self.y - player.y
         r = self.radius + player.radius
-        return dist2 <= r * r
+        return dx * dx + dy * dy <= r * r
 
 
 class Game:
     def __init__(self):
         pygame.init()
         pygame.display.set_caption(TITLE)
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        # Темп кадров задаёт vsync драйвера (работает только через рендерер SCALED).
+        # SCALED к тому же увеличивает окно в целое число раз, пока оно помещается на экран;
+        # если режим недоступен — обычное окно и ограничение FPS через clock.tick
+        try:
+            self.screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.SCALED, vsync=1)
+        except pygame.error:
+            self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+
+        # set_mode может молча вернуть обычное окно, а vsync для SDL — лишь подсказка.
+        # Ограничение FPS снимаем, только если vsync подтверждён (is_vsync есть в pygame-ce,
+        # в обычном pygame его нет), и даже тогда оставляем страховочный предел кадров
+        is_vsync = getattr(pygame.display, "is_vsync", None)
+        vsync_on = (
+            is_vsync is not None
+            and bool(self.screen.get_flags() & pygame.SCALED)
+            and is_vsync()
+        )
+        self.fps_limit = VSYNC_FPS_CAP if vsync_on else FPS
         self.clock = pygame.time.Clock()
 
+        # Поверхности кадра создаются один раз: мир полностью перерисовывается фоном,
+        # а затемнение под панелью — сплошной чёрный слой с общей прозрачностью
+        self._world = pygame.Surface((WIDTH, HEIGHT)).convert()
+        self._overlay_dim = pygame.Surface((WIDTH, HEIGHT)).convert()
+        self._overlay_dim.fill((0, 0, 0))
+        self._overlay_dim.set_alpha(140)
+
         # Шрифты (системные)
         self.font_small = pygame.font.SysFont("consolas", 20)
         self.font_ui = pygame.font.SysFont("consolas", 26, bold=True)
         self.font_big = pygame.font.SysFont("consolas", 56, bold=True)
 
+        # Кэш отрисованного текста: (шрифт, строка, цвет) -> Surface
+        self._text_cache: dict[tuple[int, str, tuple], pygame.Surface] = {}
+        self._hint_surf = self.font_small.render(
+            "WASD/Arrows - move | SPACE/SHIFT - dash | P - pause",
+            True,
+            MUTED,
+        ).convert_alpha()
+        self._dash_label = self.font_small.render("Dash", True, MUTED).convert_alpha()
+
         self.best_score = load_best_score()
+        self.rng = np.random.default_rng()
+
+        self.pulse = 1.0
 
         self.state = "menu"  # menu | playing | paused | gameover
         self.reset_run()
 
-        # Эффект дрожания камеры
+        # Эффект дрожания камеры: смещения берутся из заранее заполненной таблицы
         self.shake_time = 0.0
         self.shake_strength = 0.0
+        self._shake_table = [(random.uniform(-1, 1), random.uniform(-1, 1)) for _ in range(256)]
+        self._shake_idx = 0
 
-        # Фоновые линии
+        # Фоновые линии: сетка и диагонали рисуются один раз, в кадре остаются только blit
         self.grid_offset = 0.0
+        self.grid_spacing = 40
+
+        spacing = self.grid_spacing
+        self._bg_tile = pygame.Surface((WIDTH + spacing, HEIGHT + spacing)).convert()
+        self._bg_tile.fill(BG)
+        grid_color = (24, 28, 40)
+        for x in range(0, WIDTH + spacing, spacing):
+            pygame.draw.line(self._bg_tile, grid_color, (x, 0), (x, HEIGHT + spacing), 1)
+        for y in range(0, HEIGHT + spacing, spacing):
+            pygame.draw.line(self._bg_tile, grid_color, (0, y), (WIDTH + spacing, y), 1)
+
+        # Диагонали на прозрачном по colorkey слое (быстрее, чем попиксельная альфа)
+        self._diag_layer = pygame.Surface((WIDTH, HEIGHT)).convert()
+        self._diag_layer.fill((0, 0, 0))
+        for i in range(0, WIDTH, 120):
+            pygame.draw.line(self._diag_layer, (18, 22, 35), (i, 0), (i - 180, HEIGHT), 1)
+        self._diag_layer.set_colorkey((0, 0, 0), pygame.RLEACCEL)
 
     def reset_run(self):
         self.player = Player()
         self.enemies = []
         self.orbs = []
-        self.particles = []
+        self.particles = ParticlePool()
 
         self.score = 0
         self.time_alive = 0.0
@@ -344,21 +506,19 @@ class Game:
         self.shake_strength = max(self.shake_strength, strength)
         self.shake_time = max(self.shake_time, duration)
 
-    def spawn_burst(self, pos: Vector2, color: tuple, count=16, speed=180):
-        for _ in range(count):
-            ang = random.uniform(0, math.tau)
-            vel = Vector2(math.cos(ang), math.sin(ang)) * random.uniform(speed * 0.4, speed)
-            life = random.uniform(0.25, 0.55)
-            self.particles.append(
-                Particle(
-                    pos=Vector2(pos.x, pos.y),
-                    vel=vel,
-                    life=life,
-                    max_life=life,
-                    radius=random.uniform(2, 4),
-                    color=color,
-                )
-            )
+    def spawn_burst(self, x: float, y: float, color: tuple, count=16, speed=180):
+        rng = self.rng
+        angs = rng.uniform(0, math.tau, count)
+        speeds = rng.uniform(speed * 0.4, speed, count)
+        self.particles.emit(
+            x,
+            y,
+            np.cos(angs) * speeds,
+            np.sin(angs) * speeds,
+            rng.uniform(0.25, 0.55, count),
+            rng.uniform(2, 4, count),
+            color,
+        )
 
     def update_playing(self, dt: float):
         self.time_alive += dt
@@ -369,7 +529,7 @@ class Game:
             self.difficulty_level += 1
             self.next_difficulty_time += 10.0
             self.score += 20  # бонус за выживание на новом уровне
-            self.spawn_burst(self.player.pos, YELLOW, count=10, speed=120)
+            self.spawn_burst(self.player.x, self.player.y, YELLOW, count=10, speed=120)
 
         self.combo_timer.update(dt)
         if not self.combo_timer.active:
@@ -394,68 +554,93 @@ class Game:
             self.orbs.append(EnergyOrb())
             self.spawn_orb_timer.start(random.uniform(2.0, 3.4))
 
-        for enemy in self.enemies:
+        # Движение врагов и проверка касания игрока за один проход;
+        # реакция на столкновение ниже — только для задетых врагов
+        px, py, pr = self.player.x, self.player.y, self.player.radius
+        enemy_hits = []
+        for i, enemy in enumerate(self.enemies):
             enemy.update(dt)
+            dx = enemy.x - px
+            dy = enemy.y - py
+            r = enemy.radius + pr
+            if dx * dx + dy * dy <= r * r:
+                enemy_hits.append(i)
 
         for orb in self.orbs:
             orb.update(dt)
 
-        for p in self.particles:
-            p.update(dt)
-        self.particles = [p for p in self.particles if p.life > 0]
+        self.particles.update(dt)
 
         # Следы от быстрого движения
-        speed_len = self.player.vel.length()
+        player = self.player
+        speed_len = math.hypot(player.vx, player.vy)
         if speed_len > 250:
-            self.player.trail_accum += dt
-            while self.player.trail_accum >= 0.018:
-                self.player.trail_accum -= 0.018
-                backward = self.player.vel.normalize() if speed_len > 0 else Vector2()
-                pos = self.player.pos - backward * random.uniform(4, 16)
-                vel = Vector2(random.uniform(-20, 20), random.uniform(-20, 20))
-                self.particles.append(Particle(Vector2(pos), vel, 0.2, 0.2, 3, BLUE))
+            player.trail_accum += dt
+            back_x = player.vx / speed_len
+            back_y = player.vy / speed_len
+            # Все частицы следа за кадр выпускаются одной пачкой
+            count = int(player.trail_accum / 0.018)
+            if count:
+                player.trail_accum -= count * 0.018
+                rng = self.rng
+                back = rng.uniform(4, 16, count)
+                self.particles.emit(
+                    player.x - back_x * back,
+                    player.y - back_y * back,
+                    rng.uniform(-20, 20, count),
+                    rng.uniform(-20, 20, count),
+                    0.2,
+                    3,
+                    BLUE,
+                )
 
         # Подбор сферы энергии
-        picked = []
-        for orb in self.orbs:
+        picked_idx = []
+        for i, orb in enumerate(self.orbs):
             if orb.collides_with_player(self.player):
-                picked.append(orb)
+                picked_idx.append(i)
                 self.combo += 1
                 self.combo_timer.start(2.0)
 
                 combo_bonus = (self.combo - 1) * 5
                 self.score += orb.value + combo_bonus
-                self.spawn_burst(orb.pos, GREEN, count=14, speed=150)
+                self.spawn_burst(orb.x, orb.y, GREEN, count=14, speed=150)
                 self.add_shake(4, 0.08)
 
-        if picked:
-            self.orbs = [o for o in self.orbs if o not in picked]
+        # Удаление обменом с последним элементом: порядок сфер не важен
+        for i in reversed(picked_idx):
+            self.orbs[i] = self.orbs[-1]
+            self.orbs.pop()
 
         # Пассивные очки за выживание
         self.score += int(dt * 6)
 
         # Столкновения с врагами
-        for enemy in self.enemies:
-            if enemy.collides_with_player(self.player):
-                if self.player.can_be_hit():
-                    self.player.alive = False
-                    self.spawn_burst(self.player.pos, RED, count=32, speed=260)
-                    self.add_shake(10, 0.25)
-                    self.state = "gameover"
-                    self.best_score = max(self.best_score, self.score)
-                    save_best_score(self.best_score)
-                    break
-                else:
-                    # Во время неуязвимости от рывка — отталкиваем врага и даём чуть очков
-                    push = enemy.pos - self.player.pos
-                    if push.length_squared() > 0:
-                        enemy.direction = push.normalize()
-                    enemy.speed *= 0.92
-                    self.score += 2
+        for i in enemy_hits:
+            enemy = self.enemies[i]
+            if self.player.can_be_hit():
+                self.player.alive = False
+                self.spawn_burst(self.player.x, self.player.y, RED, count=32, speed=260)
+                self.add_shake(10, 0.25)
+                self.state = "gameover"
+                self.best_score = max(self.best_score, self.score)
+                save_best_score(self.best_score)
+                break
+            else:
+                # Во время неуязвимости от рывка — отталкиваем врага и даём чуть очков
+                push_x = enemy.x - self.player.x
+                push_y = enemy.y - self.player.y
+                dist2 = push_x * push_x + push_y * push_y
+                if dist2 > 0:
+                    inv = 1.0 / math.sqrt(dist2)
+                    enemy.dx = push_x * inv
+                    enemy.dy = push_y * inv
+                enemy.speed *= 0.92
+                self.score += 2
 
         # Ограничим число врагов, чтобы не было перегруза
         if len(self.enemies) > 70:
-            self.enemies = self.enemies[-70:]
+            del self.enemies[:len(self.enemies) - 70]
 
         # Обновление эффекта дрожания
         if self.shake_time > 0:
@@ -463,49 +648,52 @@ class Game:
             if self.shake_time == 0:
                 self.shake_strength = 0.0
 
-    def draw_background(self, target_surface: pygame.Surface):
-        target_surface.fill(BG)
+    def _text(self, font: pygame.font.Font, text: str, color: tuple) -> pygame.Surface:
+        """Рендерит строку только при изменении значения, иначе берёт готовую из кэша."""
+        key = (id(font), text, color)
+        surf = self._text_cache.get(key)
+        if surf is None:
+            # Счёт и время растут постоянно — вытесняем давно не использованные записи
+            if len(self._text_cache) >= 256:
+                del self._text_cache[next(iter(self._text_cache))]
+            surf = font.render(text, True, color).convert_alpha()
+        else:
+            # Переносим в конец: порядок словаря — от давно не использованных к свежим
+            del self._text_cache[key]
+        self._text_cache[key] = surf
+        return surf
 
-        # Сетка с лёгкой анимацией
-        spacing = 40
+    def draw_background(self, target_surface: pygame.Surface):
+        # Сетка с лёгкой анимацией: сдвигаем заранее отрисованный тайл
+        spacing = self.grid_spacing
         ox = int(self.grid_offset) % spacing
         oy = int(self.grid_offset * 0.6) % spacing
-
-        grid_color = (24, 28, 40)
-        for x in range(-spacing, WIDTH + spacing, spacing):
-            pygame.draw.line(target_surface, grid_color, (x + ox, 0), (x + ox, HEIGHT), 1)
-        for y in range(-spacing, HEIGHT + spacing, spacing):
-            pygame.draw.line(target_surface, grid_color, (0, y + oy), (WIDTH, y + oy), 1)
+        target_surface.blit(self._bg_tile, (ox - spacing, oy - spacing))
 
         # Декоративные диагонали
-        for i in range(0, WIDTH, 120):
-            pygame.draw.line(target_surface, (18, 22, 35), (i, 0), (i - 180, HEIGHT), 1)
+        target_surface.blit(self._diag_layer, (0, 0))
 
     def draw_ui(self, target_surface: pygame.Surface):
         panel_rect = pygame.Rect(12, 12, WIDTH - 24, 78)
         pygame.draw.rect(target_surface, PANEL, panel_rect, border_radius=14)
         pygame.draw.rect(target_surface, (35, 45, 65), panel_rect, 2, border_radius=14)
 
-        score_text = self.font_ui.render(f"SCORE: {self.score}", True, WHITE)
-        best_text = self.font_small.render(f"BEST: {self.best_score}", True, MUTED)
-        time_text = self.font_small.render(f"TIME: {self.time_alive:05.1f}s", True, MUTED)
+        score_text = self._text(self.font_ui, f"SCORE: {self.score}", WHITE)
+        best_text = self._text(self.font_small, f"BEST: {self.best_score}", MUTED)
+        time_text = self._text(self.font_small, f"TIME: {self.time_alive:05.1f}s", MUTED)
 
         target_surface.blit(score_text, (26, 22))
         target_surface.blit(best_text, (28, 55))
         target_surface.blit(time_text, (180, 55))
 
-        lvl_text = self.font_ui.render(f"LVL {self.difficulty_level}", True, YELLOW)
+        lvl_text = self._text(self.font_ui, f"LVL {self.difficulty_level}", YELLOW)
         target_surface.blit(lvl_text, (WIDTH - 190, 22))
 
-        hint = self.font_small.render(
-            "WASD/Arrows - move | SPACE/SHIFT - dash | P - pause",
-            True,
-            MUTED,
-        )
+        hint = self._hint_surf
         target_surface.blit(hint, (WIDTH // 2 - hint.get_width() // 2, 55))
 
         if self.combo > 1 and self.combo_timer.active:
-            combo_txt = self.font_ui.render(f"COMBO x{self.combo}", True, GREEN)
+            combo_txt = self._text(self.font_ui, f"COMBO x{self.combo}", GREEN)
             target_surface.blit(combo_txt, (WIDTH // 2 - combo_txt.get_width() // 2, 102))
 
         # Полоса кулдауна рывка
@@ -515,34 +703,41 @@ class Game:
 
         ready_ratio = 1.0
         if self.player.dash_cooldown.active:
-            ready_ratio = clamp(1.0 - self.player.dash_cooldown.time_left / 1.0, 0.0, 1.0)
+            ready_ratio = max(0.0, 1.0 - self.player.dash_cooldown.time_left / 1.0)
 
         fill_w = int((w - 2) * ready_ratio)
         if fill_w > 0:
             pygame.draw.rect(target_surface, BLUE, (x + 1, y + 1, fill_w, h - 2), border_radius=7)
 
-        dash_label = self.font_small.render("Dash", True, MUTED)
-        target_surface.blit(dash_label, (x, y + 18))
+        target_surface.blit(self._dash_label, (x, y + 18))
 
     def draw_world(self, target_surface: pygame.Surface):
         self.draw_background(target_surface)
 
+        # Сначала все свечения одним пакетом, затем тела поверх них
+        glows = []
+        for orb in self.orbs:
+            orb.append_glow(glows)
+        for enemy in self.enemies:
+            enemy.append_glow(glows)
+        self.player.append_glow(glows, self.pulse)
+        blit_batch(target_surface, glows)
+
         for orb in self.orbs:
             orb.draw(target_surface)
 
         for enemy in self.enemies:
             enemy.draw(target_surface)
 
-        for p in self.particles:
-            p.draw(target_surface)
+        sparks = []
+        self.particles.append_glow(sparks)
+        blit_batch(target_surface, sparks)
 
         self.player.draw(target_surface)
         self.draw_ui(target_surface)
 
     def draw_center_panel(self, title: str, lines: list[str], accent=BLUE):
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 140))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self._overlay_dim, (0, 0))
 
         panel_w, panel_h = 620, 320
         rect = pygame.Rect(
@@ -555,23 +750,25 @@ class Game:
         pygame.draw.rect(self.screen, (34, 46, 70), rect, 2, border_radius=18)
         pygame.draw.rect(self.screen, accent, (rect.x, rect.y, rect.w, 6), border_radius=18)
 
-        title_surf = self.font_big.render(title, True, WHITE)
+        title_surf = self._text(self.font_big, title, WHITE)
         self.screen.blit(title_surf, (rect.centerx - title_surf.get_width() // 2, rect.y + 24))
 
         y = rect.y + 118
         for line in lines:
-            surf = self.font_ui.render(line, True, MUTED if not line.startswith(">") else WHITE)
+            surf = self._text(self.font_ui, line, MUTED if not line.startswith(">") else WHITE)
             self.screen.blit(surf, (rect.centerx - surf.get_width() // 2, y))
             y += 40
 
     def draw(self):
-        world = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        world = self._world
         self.draw_world(world)
 
         # Смещение камеры (дрожание)
         if self.shake_time > 0 and self.shake_strength > 0:
-            ox = random.randint(-int(self.shake_strength), int(self.shake_strength))
-            oy = random.randint(-int(self.shake_strength), int(self.shake_strength))
+            self._shake_idx = (self._shake_idx + 1) & 255
+            sx, sy = self._shake_table[self._shake_idx]
+            ox = round(sx * self.shake_strength)
+            oy = round(sy * self.shake_strength)
         else:
             ox = oy = 0
 
@@ -656,8 +853,11 @@ class Game:
     def run(self):
         running = True
         while running:
-            dt_ms = self.clock.tick(FPS)
-            dt = clamp(dt_ms / 1000.0, 0.0, 0.05)
+            dt_ms = self.clock.tick(self.fps_limit)
+            # Время кадра читается один раз и общее для всех пульсирующих эффектов
+            now_ms = pygame.time.get_ticks()
+            self.pulse = 0.8 + 0.2 * math.sin(now_ms * 0.01)
+            dt = min(dt_ms / 1000.0, 0.05)
 
             running = self.handle_events()
 